@@ -8,6 +8,7 @@ INTERVAL=600
 
 # Function to process .ts files
 process_files() {
+  PROCESSED=0
   for FILE in "$DIRECTORY"/*.ts; do
     if [[ -f "$FILE" ]]; then
       # Extract the base name without extension
@@ -17,11 +18,12 @@ process_files() {
 
       if [[ ! -f "$OUTPUT" ]]; then
         # Run ffmpeg command
-        ffmpeg -i "$FILE" -vf scale=1280:720 -c:v libx264 -crf 28 -preset medium -c:a aac -threads 1 "$OUTPUT"
+        nice -n 10 ffmpeg -i "$FILE" -vf "scale=1280:720:flags=fast_bilinear" -c:v libx264 -crf 28 -preset veryfast -c:a copy "$OUTPUT"
         # Check if ffmpeg command was successful
         if [[ $? -eq 0 ]]; then
             # Delete the .ts file if conversion was successful
             rm "$FILE"
+            PROCESSED=1
         else
             echo "Error processing $FILE"
         fi
@@ -30,9 +32,16 @@ process_files() {
   done
 }
 
-# Infinite loop to run the process every 20 minutes
+# Rescan immediately while there is work; only idle when a pass did nothing
 while true; do
   process_files
-  echo "Waiting..."
-  sleep $INTERVAL
+  if [[ $PROCESSED -eq 0 ]]; then
+    echo "Waiting..."
+    if command -v inotifywait > /dev/null; then
+      # Block until a file lands instead of waking on a timer
+      inotifywait -q -t $INTERVAL -e close_write -e moved_to "$DIRECTORY" > /dev/null
+    else
+      sleep $INTERVAL
+    fi
+  fi
 done
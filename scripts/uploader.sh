@@ -6,29 +6,48 @@ DIRECTORY="/root/m3u8-crawler/videos/"
 # Interval in seconds (20 minutes)
 INTERVAL=600
 
+# Compile once at startup; node on the built output starts far faster
+# than ts-node re-transpiling the tree for every batch. Bail out on a
+# failed build rather than looping against a missing or stale dist
+pnpm build || { echo "build failed" >&2; exit 1; }
+
 # Function to process .ts files
 process_files() {
+  PROCESSED=0
+  FILES=()
   for FILE in "$DIRECTORY"/*.mp4; do
     if [[ -f "$FILE" ]]; then
       BASENAME=$(basename "$FILE" .mp4)
       TS_FILE="$DIRECTORY/$BASENAME.ts"
-      # Run command
       if [[ ! -f "$TS_FILE" ]]; then
-        pnpm ts-node src/upload.ts $FILE
-        if [[ $? -eq 0 ]]; then
-          # Delete the .ts file if conversion was successful
-          rm "$FILE"
-        else
-          echo "Error uploading $FILE"
-        fi
+        FILES+=("$FILE")
       fi
     fi
   done
+
+  if [[ ${#FILES[@]} -gt 0 ]]; then
+    # One process for the whole batch so the S3 client is set up once;
+    # upload.ts deletes each file once its own upload has succeeded
+    node dist/upload.js "${FILES[@]}"
+    if [[ $? -eq 0 ]]; then
+      PROCESSED=1
+    else
+      # Files that failed are still on disk and retried next pass
+      echo "Error uploading files"
+    fi
+  fi
 }
 
-# Infinite loop to run the process every 20 minutes
+# Rescan immediately while there is work; only idle when a pass did nothing
 while true; do
   process_files
-  echo "Waiting..."
-  sleep $INTERVAL
+  if [[ $PROCESSED -eq 0 ]]; then
+    echo "Waiting..."
+    if command -v inotifywait > /dev/null; then
+      # Block until a file lands instead of waking on a timer
+      inotifywait -q -t $INTERVAL -e close_write -e moved_to "$DIRECTORY" > /dev/null
+    else
+      sleep $INTERVAL
+    fi
+  fi
 done
@@ -8,47 +8,64 @@ export const runFFmpeg = async (
   outputFile: string
 ): Promise<string> => {
   const fileName = `${outputFile}-${formatDate(new Date())}.ts`;
-  const concatCommand = `ffmpeg -loglevel error -f concat -safe 0 -i "${fileListPath}" -c copy -threads 1 "${fileName}"`;
-  await execPromise(concatCommand);
+  const concatArgs = [
+    "-loglevel", "error",
+    "-f", "concat",
+    "-safe", "0",
+    "-i", fileListPath,
+    "-c", "copy",
+    fileName,
+  ];
+  await execPromise("ffmpeg", concatArgs);
   return fileName;
 };
 
-export const deleteTmpFiles = (
-  fileListPath: string,
-  inputDir: string
-): void => {
-  // Delete the filelist.txt file
-  fs.unlinkSync(fileListPath);
+export const deleteTmpFiles = (inputDir: string): void => {
+  // filelist.txt lives inside the input directory, so removing the
+  // directory recursively cleans up everything in one call
   fs.rmSync(inputDir, { recursive: true, force: true });
-  logger.info("filelist.txt has been deleted.");
+  logger.info("Temporary segment directory has been deleted.");
 };
 
-export const generateFileList = (inputDir: string): string => {
-  const files = fs
-    .readdirSync(inputDir)
-    .filter((file) => path.extname(file) === ".ts");
-  // Create the file list
-  const fileListPath = path.join(inputDir, "filelist.txt");
-  const fileListContent = files.map((file) => `file '${file}'`).join("\n");
-  fs.writeFileSync(fileListPath, fileListContent);
-  return fileListPath;
-};
+// Saved segment names are a formatDate prefix followed by the original
+// name with its trailing segment number
+const TIMESTAMP_LENGTH = formatDate(new Date()).length;
 
-export const removeEmptyFiles = async (folderPath: string): Promise<void> => {
-  try {
-    const files = await fs.promises.readdir(folderPath);
+const segmentNumber = (file: string): number =>
+  Number(file.slice(file.lastIndexOf("_") + 1, file.lastIndexOf(".")));
 
-    const removeFilePromises = files.map(async (file) => {
-      const filePath = path.join(folderPath, file);
+export const generateFileList = async (inputDir: string): Promise<string> => {
+  const files = (await fs.promises.readdir(inputDir)).filter((file) =>
+    file.endsWith(".ts")
+  );
+
+  // Drop empty segments and keep the rest, in a single directory pass
+  const keptFiles: string[] = [];
+  await Promise.all(
+    files.map(async (file) => {
+      const filePath = path.join(inputDir, file);
       const stat = await fs.promises.stat(filePath);
 
-      if (stat.isFile() && stat.size === 0) {
+      if (stat.size === 0) {
         await fs.promises.unlink(filePath);
+      } else {
+        keptFiles.push(file);
       }
-    });
+    })
+  );
+
+  // Sort by the capture timestamp prefix, then break same-second ties
+  // numerically on the segment number; a plain lexicographic sort would
+  // put "_999" after "_1000"
+  keptFiles.sort(
+    (a, b) =>
+      a.slice(0, TIMESTAMP_LENGTH).localeCompare(b.slice(0, TIMESTAMP_LENGTH)) ||
+      segmentNumber(a) - segmentNumber(b)
+  );
 
-    await Promise.all(removeFilePromises);
-  } catch (error) {
-    logger.error("Error removing empty files:", error);
-  }
+  // Create the file list
+  const fileListPath = path.join(inputDir, "filelist.txt");
+  const fileListContent = keptFiles.map((file) => `file '${file}'`).join("\n");
+  fs.writeFileSync(fileListPath, fileListContent);
+  return fileListPath;
 };
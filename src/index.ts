@@ -1,70 +1,92 @@
 import path from "path";
 import fs from "fs";
-import puppeteer, { Browser, HTTPRequest, Page } from "puppeteer";
+import puppeteer, { Browser, HTTPResponse, Page } from "puppeteer";
 import { findPerson } from "./scraper";
 import { setTimeout } from "timers/promises";
 import EventEmitter from "events";
 import { formatDate } from "./utils";
-import {
-  deleteTmpFiles,
-  generateFileList,
-  removeEmptyFiles,
-  runFFmpeg,
-} from "./files";
+import { deleteTmpFiles, generateFileList, runFFmpeg } from "./files";
 import logger from "./logger";
-import { compact, uniq } from "lodash";
+import { compact } from "lodash";
 
 class Crawler {
-  HAD_NEW_REQUEST = [true, true];
+  // One slot of state per tab, so the tab count actually scales past 2
+  PAGE_NB = Number(process.argv[2]) || 2;
   MAX_ATTEMPTS = 3;
   SHOULD_STOP = false;
+  stopController = new AbortController();
 
-  currentUsernames: string[] = ["", ""];
-  currentInputDirectories: string[] = ["", ""];
-  currentPageFilesNumber: Set<number>[] = [new Set(), new Set()];
+  currentUsernames: string[] = Array(this.PAGE_NB).fill("");
+  currentInputDirectories: string[] = Array(this.PAGE_NB).fill("");
+  currentPageFilesNumber: Set<number>[] = Array.from(
+    { length: this.PAGE_NB },
+    () => new Set()
+  );
+  pendingProcessing: Promise<void>[] = [];
 
   reset = (): void => {
-    this.currentUsernames = ["", ""];
-    this.currentInputDirectories = ["", ""];
-    this.currentPageFilesNumber = [new Set(), new Set()];
+    // The arrays are sized once for the tab count, so clear them in
+    // place instead of reallocating every cycle
+    this.currentUsernames.fill("");
+    this.currentInputDirectories.fill("");
+    for (const fileNumbers of this.currentPageFilesNumber) {
+      fileNumbers.clear();
+    }
   };
 
-  onRequest = async (
-    request: HTTPRequest,
+  onResponse = async (
+    response: HTTPResponse,
     fileNumbers: Set<number>,
     inputDirectory: string,
     index: number
   ): Promise<void> => {
-    if (request.url().endsWith(".ts")) {
-      const url = request.url();
-      const response = await fetch(request.url());
-      const buffer = Buffer.from(await response.arrayBuffer());
-      if (buffer.byteLength === 0) {
-        request.continue();
-        return;
-      }
-      const urlPath =
-        `${formatDate(new Date())}${new URL(request.url()).pathname
-          .split("/")
-          .pop()}` || "error";
-      const filePath = path.join(inputDirectory, urlPath);
-
+    const url = response.url();
+    if (url.endsWith(".ts")) {
+      // The segment number is a cheap fingerprint: drop duplicates before
+      // pulling the body over the DevTools protocol
       const fileNumber = Number(
         url.slice(url.lastIndexOf("_") + 1, url.lastIndexOf("."))
       );
 
       if (fileNumbers.has(fileNumber)) {
-        request.continue();
         return;
       }
+      // Claim the number before the first await so a concurrent response
+      // for the same segment cannot pass the check while this one is
+      // still in flight
+      fileNumbers.add(fileNumber);
 
-      fs.mkdirSync(path.dirname(filePath), { recursive: true });
-      fs.writeFileSync(filePath, buffer);
+      try {
+        // Reuse the bytes the browser already downloaded instead of
+        // fetching the segment a second time
+        const buffer = await response.buffer();
+        if (buffer.byteLength === 0) {
+          fileNumbers.delete(fileNumber);
+          return;
+        }
 
-      fileNumbers.add(fileNumber);
-      this.HAD_NEW_REQUEST[index] = true;
+        // Only build the timestamped name for segments we actually keep;
+        // a single slice replaces the URL parse + split round trip
+        const fileName = `${formatDate(new Date())}${url.slice(
+          url.lastIndexOf("/") + 1
+        )}`;
+        const filePath = path.join(inputDirectory, fileName);
+
+        // Async write so a slow disk never blocks the event loop that is
+        // also receiving the other tab's segments
+        await fs.promises.writeFile(filePath, buffer);
+      } catch (error) {
+        // Release the claim so a later retry of this segment is not
+        // mistaken for a duplicate
+        fileNumbers.delete(fileNumber);
+        // buffer() rejects for redirects or when the page navigates away
+        // while the segment is in flight; skip the segment
+        logger.error("An error occurred while saving a segment:", {
+          index,
+          metadata: { url, error },
+        });
+      }
     }
-    request.continue();
   };
 
   concatVideos = async (
@@ -76,35 +98,28 @@ class Crawler {
     try {
       logger.info("Starting ffmpeg...");
       // Concatenate the files using ffmpeg
-      try {
-        const realFileName = await runFFmpeg(fileListPath, outputFile);
-        logger.info("ts file created successfully");
-        const sourcePath = path.join(realFileName);
-        const destinationPath = path.join("videos", realFileName);
-        logger.info("Moving file to videos folder...", {
-          metadata: { sourcePath, destinationPath },
-        });
-        fs.renameSync(sourcePath, destinationPath);
-        deleteTmpFiles(fileListPath, inputDirectory);
-      } catch (error) {
-        logger.error("An error occurred while concatenating the files:", {
-          metadata: { error },
-        });
-        if (attempt < this.MAX_ATTEMPTS) {
-          logger.info("Retrying...");
-          return this.concatVideos(
-            fileListPath,
-            outputFile,
-            inputDirectory,
-            attempt + 1
-          );
-        }
-        logger.error("Max attempts reached. Exiting...", {});
-      }
+      const realFileName = await runFFmpeg(fileListPath, outputFile);
+      logger.info("ts file created successfully");
+      const destinationPath = path.join("videos", realFileName);
+      logger.info("Moving file to videos folder...", {
+        metadata: { realFileName, destinationPath },
+      });
+      fs.renameSync(realFileName, destinationPath);
+      deleteTmpFiles(inputDirectory);
     } catch (error) {
-      logger.error("An error occurred:", {
+      logger.error("An error occurred while concatenating the files:", {
         metadata: { error },
       });
+      if (attempt < this.MAX_ATTEMPTS) {
+        logger.info("Retrying...");
+        return this.concatVideos(
+          fileListPath,
+          outputFile,
+          inputDirectory,
+          attempt + 1
+        );
+      }
+      logger.error("Max attempts reached. Exiting...", {});
     }
   };
 
@@ -116,7 +131,10 @@ class Crawler {
     eventEmitter.on("keyPress", (key) => {
       if (key === "q") {
         this.SHOULD_STOP = true;
-        logger.info("Exiting after 5 minutes maximum...");
+        // Wake the crawl loop immediately instead of letting it sleep
+        // out the rest of the current tick
+        this.stopController.abort();
+        logger.info("Exiting once current downloads are processed...");
       }
     });
 
@@ -152,16 +170,18 @@ class Crawler {
         return this.currentInputDirectories[index];
       }
       const inputDirectory = `${username}-${formatDate(new Date())}`;
+      // Create the directory once per stream rather than on every segment
+      fs.mkdirSync(inputDirectory, { recursive: true });
       this.currentInputDirectories[index] = inputDirectory;
       this.currentUsernames[index] = username;
       this.currentPageFilesNumber[index] = new Set();
       const url = `${process.env.URL}/${username}/`;
 
-      page.removeAllListeners("request");
+      page.removeAllListeners("response");
 
-      page.on("request", (request) => {
-        this.onRequest(
-          request,
+      page.on("response", (response) => {
+        this.onResponse(
+          response,
           this.currentPageFilesNumber[index],
           this.currentInputDirectories[index],
           index
@@ -179,13 +199,6 @@ class Crawler {
         downloads: this.currentPageFilesNumber[index].size,
       },
     });
-    if (!this.HAD_NEW_REQUEST[index]) {
-      if (this.currentPageFilesNumber[index].size === 0) {
-        return undefined;
-      }
-      return this.currentInputDirectories[index];
-    }
-    this.HAD_NEW_REQUEST[index] = false;
     if (this.currentPageFilesNumber[index].size === 0) {
       return undefined;
     }
@@ -193,77 +206,102 @@ class Crawler {
   };
 
   launch = async (): Promise<void> => {
-    while (true) {
-      const browser: Browser = await puppeteer.launch({
-        defaultViewport: { width: 1920, height: 1080 },
-        args: [
-          "--no-sandbox",
-          "--disable-setuid-sandbox",
-          "--disable-dev-shm-usage",
-          "--disable-session-crashed-bubble",
-          "--disable-accelerated-2d-canvas",
-          "--no-first-run",
-          "--no-zygote",
-          "--single-process",
-          "--noerrdialogs",
-          "--disable-gpu",
-        ],
-      });
-      const pageNb = Number(process.argv[2]) || 2;
-      for (let i = 1; i < pageNb; i++) {
-        await browser.newPage();
-      }
+    // Make sure the destination folder exists once at startup, instead
+    // of every concat rename failing into the retry loop when it is
+    // missing
+    fs.mkdirSync("videos", { recursive: true });
 
-      const pages = await browser.pages();
-      this.interactions();
+    // Launch the browser once and reuse it across processing cycles
+    // instead of paying a full Chromium startup every hour
+    const browser: Browser = await puppeteer.launch({
+      defaultViewport: { width: 1920, height: 1080 },
+      args: [
+        "--no-sandbox",
+        "--disable-setuid-sandbox",
+        "--disable-dev-shm-usage",
+        "--disable-session-crashed-bubble",
+        "--disable-accelerated-2d-canvas",
+        "--no-first-run",
+        "--no-zygote",
+        "--single-process",
+        "--noerrdialogs",
+        "--disable-gpu",
+      ],
+    });
+    for (let i = 1; i < this.PAGE_NB; i++) {
+      await browser.newPage();
+    }
 
-      for (const page of pages) {
-        await page.setRequestInterception(true);
-      }
+    const pages = await browser.pages();
+    this.interactions();
 
+    while (true) {
       let minutesElapsed = 0;
-      let outputFileDirs: (string | undefined)[] = [];
+      const outputFileDirs = new Set<string>();
       while (!this.SHOULD_STOP && minutesElapsed < 60) {
-        outputFileDirs.push(
-          ...compact(
-            await Promise.all(
-              pages.map((page, index) => this.handleTab(page, index))
-            )
+        for (const dir of compact(
+          await Promise.all(
+            pages.map((page, index) => this.handleTab(page, index))
           )
-        );
-        outputFileDirs = uniq(outputFileDirs);
+        )) {
+          outputFileDirs.add(dir);
+        }
         logger.info("Waiting for new requests");
-        await setTimeout(60_000 * 5);
+        try {
+          await setTimeout(60_000 * 5, undefined, {
+            signal: this.stopController.signal,
+          });
+        } catch {
+          break;
+        }
         minutesElapsed += 5;
       }
 
-      await browser.close();
+      // Stop capturing segments while the directories are concatenated;
+      // the browser itself stays up
+      for (const page of pages) {
+        page.removeAllListeners("response");
+      }
 
       this.reset();
 
-      for (const outputDirectory of outputFileDirs) {
-        if (!outputDirectory) {
-          continue;
-        }
-        const inputDirectory = path.join(process.cwd(), outputDirectory);
-        const outputFileName = path.basename(outputDirectory);
-        await removeEmptyFiles(inputDirectory);
-        const fileListPath = generateFileList(inputDirectory);
-        await this.concatVideos(
-          fileListPath,
-          outputFileName,
-          inputDirectory,
-          0
-        );
-      }
+      // Concatenate every directory in parallel; stream copies are I/O
+      // bound so the ffmpeg runs overlap instead of queueing. The next
+      // cycle records into fresh timestamped directories, so this can
+      // keep running in the background while crawling resumes
+      this.pendingProcessing.push(
+        Promise.all(
+          [...outputFileDirs].map(async (outputDirectory) => {
+            const inputDirectory = path.join(process.cwd(), outputDirectory);
+            const outputFileName = path.basename(outputDirectory);
+            const fileListPath = await generateFileList(inputDirectory);
+            await this.concatVideos(
+              fileListPath,
+              outputFileName,
+              inputDirectory,
+              0
+            );
+          })
+        ).then(
+          () => undefined,
+          (error) => {
+            logger.error("An error occurred while processing directories:", {
+              metadata: { error },
+            });
+          }
+        )
+      );
 
       if (this.SHOULD_STOP) {
         break;
       }
 
-      logger.info("Browser closed");
+      logger.info("Processing cycle finished");
     }
 
+    // Let any background concatenation finish before shutting down
+    await Promise.all(this.pendingProcessing);
+    await browser.close();
     process.exit();
   };
 }
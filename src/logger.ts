@@ -17,7 +17,7 @@ const customFormat = format.combine(
       index: info.index, // Include index if present
       ...(info.metadata && { metadata: info.metadata }), // Include meta if present
     };
-    return JSON.stringify(logEntry, null, 2); // Pretty-print with 2 spaces of indentation
+    return JSON.stringify(logEntry); // Compact output, one line per entry
   })
 );
 
@@ -15,25 +15,58 @@ interface OutputType {
   currentShow: string;
 }
 
+// Every tab asks for the same listing on the same tick, so share the
+// in-flight request between concurrent callers instead of fetching
+// once per tab; caching the resolved value would still let each tab
+// start its own fetch before the first one lands
+const CACHE_TTL_MS = 60_000;
+let cachedPromise: Promise<OutputType[]> | undefined;
+let cachedAt = 0;
+
+const doFetch = async (): Promise<OutputType[]> => {
+  const infos = await fetch(process.env.API_URL ?? "https://api.example.com");
+  return (await infos.json()).results.map(
+    (result: ApiType): OutputType => ({
+      username: result.username,
+      numUsers: result.num_users,
+      currentShow: result.current_show,
+    })
+  );
+};
+
+const fetchResults = (): Promise<OutputType[]> => {
+  if (!cachedPromise || Date.now() - cachedAt >= CACHE_TTL_MS) {
+    const promise = doFetch();
+    cachedPromise = promise;
+    cachedAt = Date.now();
+    // Do not serve a failed fetch from the cache; the next caller
+    // retries instead
+    promise.catch(() => {
+      if (cachedPromise === promise) {
+        cachedPromise = undefined;
+      }
+    });
+  }
+  return cachedPromise;
+};
+
 export const findPerson = async (
   index: number
 ): Promise<string | undefined> => {
-  const infos = await fetch(process.env.API_URL ?? "https://api.example.com");
-
   try {
-    const jsonRes: OutputType[] = (await infos.json()).results.map(
-      (result: ApiType): OutputType => ({
-        username: result.username,
-        numUsers: result.num_users,
-        currentShow: result.current_show,
-      })
-    );
+    const jsonRes = await fetchResults();
+    // Index the listing by username once instead of scanning it in full
+    // for every tracked person
+    const publicShows = new Map<string, OutputType>();
+    for (const logged of jsonRes) {
+      if (logged.currentShow === "public") {
+        publicShows.set(logged.username, logged);
+      }
+    }
+
     const loggedIn = [];
     for (const person of list) {
-      const loggedInPerson = jsonRes.find(
-        (logged) =>
-          logged.username === person.username && logged.currentShow === "public"
-      );
+      const loggedInPerson = publicShows.get(person.username);
       if (loggedInPerson) {
         loggedIn.push({
           username: person.username,
@@ -43,27 +76,12 @@ export const findPerson = async (
       }
     }
 
-    const sortedByViewers = loggedIn.sort((a, b) => b.viewers - a.viewers);
-    const rankOne = sortedByViewers.filter((person) => person.rank === 1);
-    if (rankOne.length > index) {
-      return rankOne[index].username;
-    }
-    const rankTwo = sortedByViewers.filter((person) => person.rank === 2);
-    if (rankOne.length + rankTwo.length > index) {
-      return rankTwo[index - rankOne.length].username;
-    }
-    const rankThree = sortedByViewers.filter((person) => person.rank === 3);
-    if (rankOne.length + rankTwo.length + rankThree.length > index) {
-      return rankThree[index - rankOne.length - rankTwo.length].username;
-    }
-    const rankFour = sortedByViewers.filter((person) => person.rank === 4);
-    if (
-      rankOne.length + rankTwo.length + rankThree.length + rankFour.length >
-      index
-    ) {
-      return rankFour[
-        index - rankOne.length - rankTwo.length - rankThree.length
-      ].username;
+    // Sort once by rank then viewers instead of one filter pass per rank
+    const candidates = loggedIn
+      .filter((person) => person.rank <= 4)
+      .sort((a, b) => a.rank - b.rank || b.viewers - a.viewers);
+    if (candidates.length > index) {
+      return candidates[index].username;
     }
   } catch (e) {
     logger.error("Error fetching data", { index, metadata: e });
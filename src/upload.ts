@@ -13,6 +13,15 @@ const ACCESS_KEY_ID = process.env.R2_ACCESS_KEY ?? "";
 const SECRET_ACCESS_KEY = process.env.R2_SECRET_KEY ?? "";
 const BUCKET_NAME = process.env.R2_BUCKET ?? ""; // Replace with your actual bucket name
 
+// Fail before any client setup or disk reads when the target is not
+// configured, instead of erroring out mid-upload
+if (!ENDPOINT || !ACCESS_KEY_ID || !SECRET_ACCESS_KEY || !BUCKET_NAME) {
+  logger.error(
+    "Missing R2 configuration; set R2_ENDPOINT, R2_ACCESS_KEY, R2_SECRET_KEY and R2_BUCKET"
+  );
+  process.exit(1);
+}
+
 // Configure the S3 client to use Cloudflare R2
 const s3Client = new S3Client({
   region: REGION,
@@ -25,13 +34,16 @@ const s3Client = new S3Client({
 
 async function uploadFile(filePath: string): Promise<void> {
   const fileStream = fs.createReadStream(filePath);
-  const fileName = `${path.basename(filePath).slice(0, -44)}/${path.basename(
-    filePath
-  )}`;
+  const baseName = path.basename(filePath);
+  const fileName = `${baseName.slice(0, -44)}/${baseName}`;
 
-  // Create an upload object from AWS SDK's lib-storage
+  // Create an upload object from AWS SDK's lib-storage. Large parts cut
+  // the request count on multi-GB videos and four in flight keep the
+  // link busy while the next part is read from disk
   const upload = new Upload({
     client: s3Client,
+    queueSize: 4,
+    partSize: 64 * 1024 * 1024,
     params: {
       Bucket: BUCKET_NAME,
       Key: fileName,
@@ -40,14 +52,18 @@ async function uploadFile(filePath: string): Promise<void> {
     },
   });
 
+  // Only log every 10% step instead of formatting a line per part event
+  let lastLoggedPercent = 0;
   upload.on("httpUploadProgress", (progress) => {
-    logger.info(
-      `Uploaded ${progress.loaded} bytes out of ${
-        progress.total
-      } bytes. (${Math.round(
-        ((progress.loaded ?? 1) / (progress.total ?? 1)) * 100
-      )}%)`
+    const percent = Math.round(
+      ((progress.loaded ?? 0) / (progress.total ?? 1)) * 100
     );
+    if (percent >= lastLoggedPercent + 10) {
+      lastLoggedPercent = percent;
+      logger.info(
+        `Uploaded ${progress.loaded} bytes out of ${progress.total} bytes. (${percent}%)`
+      );
+    }
   });
 
   try {
@@ -57,11 +73,26 @@ async function uploadFile(filePath: string): Promise<void> {
     logger.info("File uploaded successfully:", {
       metadata: { fileName, response },
     });
-    process.exit();
+    // Remove the file as soon as its own upload has succeeded, so one
+    // failing file in the batch cannot force re-uploads of the others
+    await fs.promises.unlink(filePath);
   } catch (err) {
     logger.error("Error uploading file:", { metadata: err });
+    process.exitCode = 1;
+  }
+}
+
+// Upload every file given on the command line with the same client, so
+// the S3 setup cost is paid once per batch instead of once per file
+async function uploadFiles(filePaths: string[]): Promise<void> {
+  if (filePaths.length === 0) {
+    logger.error("No files given; usage: upload.ts <file> [files...]");
+    process.exit(1);
+  }
+  for (const filePath of filePaths) {
+    await uploadFile(filePath);
   }
+  process.exit();
 }
 
-const filePath = process.argv[2] ?? "";
-uploadFile(filePath);
+uploadFiles(process.argv.slice(2));
@@ -1,8 +1,10 @@
-import { exec } from "child_process";
+import { spawn } from "child_process";
 import logger from "./logger";
 
+// Shared by every formatDate call instead of being rebuilt per call
+const pad = (n: number): string => ("0" + n).slice(-2);
+
 export function formatDate(date: Date): string {
-  const pad = (n: number) => ("0" + n).slice(-2);
   return `${date.getFullYear()}-${pad(date.getMonth() + 1)}-${pad(
     date.getDate()
   )}_${pad(date.getHours())}-${pad(date.getMinutes())}-${pad(
@@ -10,23 +12,38 @@ export function formatDate(date: Date): string {
   )}`;
 }
 
-export const execPromise = (command: string): Promise<boolean> => {
+export const execPromise = (
+  command: string,
+  args: string[]
+): Promise<boolean> => {
   return new Promise((resolve, reject) => {
-    const process = exec(command);
-
-    process.stdout?.on("data", (data: Buffer) => {
-      logger.info(data.toString());
+    // Spawn the binary directly: no intermediate shell to fork and no
+    // file name quoting to get wrong. Discard stdout explicitly: a
+    // piped stream nothing drains would block the child once the pipe
+    // buffer fills
+    const process = spawn(command, args, {
+      stdio: ["ignore", "ignore", "pipe"],
     });
 
+    // Collect stderr and only surface it when the command fails; exit
+    // code is the sole source of truth for success
+    let stderr = "";
     process.stderr?.on("data", (data: Buffer) => {
-      logger.error(data.toString());
-      reject(new Error("Command failed"));
+      stderr += data.toString();
+    });
+
+    // "close" never fires when the binary cannot be spawned at all
+    // (e.g. ffmpeg missing from PATH), so reject from "error" too
+    process.on("error", (error: Error) => {
+      logger.error(`Failed to start ${command}:`, { metadata: { error } });
+      reject(error);
     });
 
     process.on("close", (code: number) => {
       if (code === 0) {
         resolve(true);
       } else {
+        logger.error(stderr);
         reject(new Error(`Command failed with code ${code}`));
       }
     });